@@ -1,38 +1,99 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, BackgroundTasks
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, status, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient, ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import os
+import base64
+import binascii
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional
 import uuid
+import time
+import hashlib
 from datetime import datetime, timezone, timedelta
 import jwt
+import orjson
+from cachetools import TTLCache
+try:
+    from ciso8601 import parse_datetime as _parse_dt
+except ImportError:
+    _parse_dt = datetime.fromisoformat
 import bcrypt
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+import httpx
+import redis.asyncio as redis
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncMongoClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', 100)),
+    minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', 10))
+)
 db = client[os.environ['DB_NAME']]
 
 # JWT Configuration
 JWT_SECRET = os.environ.get('JWT_SECRET', 'autotrack-secret')
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
+AUTH_CACHE_TTL_SECONDS = 60
+
+# Decoded token -> (payload, user) cache, keyed by SHA-256 of the raw token. Each
+# worker has its own copy, so only fields the API never changes are cached; settings
+# are read from Mongo by the routes that use them
+_auth_cache = TTLCache(maxsize=10000, ttl=AUTH_CACHE_TTL_SECONDS)
+
+# bcrypt runs off the event loop on a bounded pool; callers beyond the
+# queue limit are shed with a 503 instead of piling up
+bcrypt_pool = ThreadPoolExecutor(max_workers=int(os.environ.get('BCRYPT_POOL', (os.cpu_count() or 1) * 2)))
+_bcrypt_slots = asyncio.Semaphore(500)
+
+# BCRYPT_COST pins the work factor; otherwise startup raises the cost above
+# BCRYPT_MIN_COST while a single hash stays under BCRYPT_TARGET_SECONDS on this
+# host. Calibration never goes below the floor; only BCRYPT_COST can
+BCRYPT_COST = os.environ.get('BCRYPT_COST')
+BCRYPT_TARGET_SECONDS = float(os.environ.get('BCRYPT_TARGET_SECONDS', 0.25))
+BCRYPT_MIN_COST = 12
+bcrypt_rounds = BCRYPT_MIN_COST
+
+# Login brute-force protection: recently rejected (password_hash, sha256(password))
+# pairs are refused without re-running bcrypt, and each client IP may only
+# have a few logins in flight at once
+FAILED_LOGIN_DELAY_SECONDS = 0.25
+LOGIN_CONCURRENCY_PER_IP = int(os.environ.get('LOGIN_CONCURRENCY_PER_IP', 4))
+_failed_logins = TTLCache(maxsize=20000, ttl=30)
+# client IP -> [semaphore, holders]; an entry is dropped only once nobody holds
+# or waits on it, so the allowance can never be reset mid-flight by eviction
+_login_slots = {}
+
+# Proxies whose X-Forwarded-For is trusted when resolving the client IP. Like
+# uvicorn's --forwarded-allow-ips only loopback is trusted by default; list the
+# ingress addresses (comma-separated), or '*' if only the ingress can reach the app
+FORWARDED_ALLOW_IPS = {ip.strip() for ip in os.environ.get('FORWARDED_ALLOW_IPS', '127.0.0.1').split(',') if ip.strip()}
 
 # SendGrid Configuration
 SENDGRID_API_KEY = os.environ.get('SENDGRID_API_KEY')
 SENDER_EMAIL = os.environ.get('SENDER_EMAIL', 'noreply@autotrack.com')
+SENDGRID_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+
+# Redis Configuration (optional; dashboard stats are cached when set)
+REDIS_URL = os.environ.get('REDIS_URL')
+DASHBOARD_STATS_TTL_SECONDS = 30
+redis_client = redis.from_url(REDIS_URL, decode_responses=True) if REDIS_URL else None
 
-app = FastAPI(title="Garage Tracker API")
+# Shared HTTP client so outbound calls reuse pooled keep-alive connections
+http_client = httpx.AsyncClient(timeout=10)
+
+app = FastAPI(title="Garage Tracker API", default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 security = HTTPBearer()
 
@@ -108,6 +169,9 @@ class MaintenanceTaskCreate(BaseModel):
     replacement_requested: bool = False
     replacement_reason: Optional[str] = None
 
+class BootstrapTaskCreate(MaintenanceTaskCreate):
+    car_id: Optional[str] = None  # filled in with the new car's id
+
 class MaintenanceTaskUpdate(BaseModel):
     task_type: Optional[str] = None
     description: Optional[str] = None
@@ -172,13 +236,58 @@ class ReminderSettingsUpdate(BaseModel):
     push_notifications: Optional[bool] = None
     reminder_days_before: Optional[int] = None
 
-# ==================== AUTH HELPERS ====================
+class BootstrapRequest(BaseModel):
+    user: UserCreate
+    car: CarCreate
+    task: Optional[BootstrapTaskCreate] = None
+
+class BootstrapResponse(TokenResponse):
+    car: CarResponse
+    task: Optional[MaintenanceTaskResponse] = None
+
+# ==================== PROJECTIONS ====================
+
+# Positive projections so only fields the responses use are sent and decoded.
+# List endpoints return these documents as an ORJSONResponse, which FastAPI
+# sends without response_model validation, so they are trusted to match the models.
+COMPUTED_TASK_FIELDS = ("status", "next_due_mileage", "next_due_date")
+USER_PROJ = {"_id": 0, "id": 1, "email": 1, "name": 1, "created_at": 1}
+SETTINGS_PROJ = {"_id": 0, "settings": 1}
+LOGIN_PROJ = {"_id": 0, "id": 1, "email": 1, "name": 1, "created_at": 1, "password_hash": 1}
+CAR_PROJ = {"_id": 0, **{f: 1 for f in CarResponse.model_fields}}
+CAR_MILEAGE_PROJ = {"_id": 0, "current_mileage": 1}
+TASK_PROJ = {"_id": 0, **{f: 1 for f in MaintenanceTaskResponse.model_fields if f not in COMPUTED_TASK_FIELDS}}
+TASK_STATUS_PROJ = {
+    "_id": 0, "car_id": 1, "replacement_requested": 1, "last_performed_mileage": 1,
+    "interval_miles": 1, "last_performed_date": 1, "interval_months": 1
+}
+MILEAGE_LOG_PROJ = {"_id": 0, **{f: 1 for f in MileageLogResponse.model_fields}}
+NOTIFICATION_PROJ = {"_id": 0, **{f: 1 for f in NotificationResponse.model_fields}}
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+# ==================== AUTH HELPERS ====================
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+async def run_bcrypt(func, *args):
+    if _bcrypt_slots.locked():
+        raise HTTPException(status_code=503, detail="Server busy, try again", headers={"Retry-After": "1"})
+    async with _bcrypt_slots:
+        return await asyncio.get_running_loop().run_in_executor(bcrypt_pool, func, *args)
+
+async def hash_password(password: str) -> str:
+    hashed = await run_bcrypt(bcrypt.hashpw, password.encode(), bcrypt.gensalt(bcrypt_rounds))
+    return hashed.decode()
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await run_bcrypt(bcrypt.checkpw, password.encode(), hashed.encode())
+
+def calibrate_bcrypt_rounds() -> int:
+    rounds = BCRYPT_MIN_COST
+    for cost in range(BCRYPT_MIN_COST + 1, 15):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(cost))
+        if time.perf_counter() - start > BCRYPT_TARGET_SECONDS:
+            break
+        rounds = cost
+    return rounds
 
 def create_token(user_id: str, email: str) -> str:
     payload = {
@@ -189,39 +298,127 @@ def create_token(user_id: str, email: str) -> str:
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    key = hashlib.sha256(credentials.credentials.encode()).digest()
+    cached = _auth_cache.get(key)
+    if cached:
+        payload, user = cached
+        # Never serve a cached entry past the token's own expiry
+        if payload["exp"] > time.time():
+            return user
+        _auth_cache.pop(key, None)
+
     try:
         payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("user_id")
-        user = await db.users.find_one({"id": user_id}, {"_id": 0})
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        return user
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    user = await db.users.find_one({"id": payload.get("user_id")}, USER_PROJ)
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    _auth_cache[key] = (payload, user)
+    return user
+
+# ==================== CACHE HELPERS ====================
+
+def dashboard_stats_key(user_id: str) -> str:
+    return f"stats:{user_id}"
+
+async def invalidate_dashboard_stats(user_id: str):
+    if not redis_client:
+        return
+    try:
+        await redis_client.delete(dashboard_stats_key(user_id))
+    except redis.RedisError as e:
+        logger.warning(f"Failed to invalidate dashboard stats: {e}")
+
+# ==================== PAGINATION HELPERS ====================
+
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Keyset cursors carry the sort key of the last item on a page, so each page is
+# an index seek instead of a skip over everything before it
+def encode_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode()
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Both values go straight into the Mongo filter, so anything but strings
+    # (e.g. {"$ne": null}) would be an operator injection
+    if not isinstance(values, list) or len(values) != 2 or not all(isinstance(v, str) for v in values):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def keyset_filter(field: str, cursor: str, op: str) -> dict:
+    value, last_id = decode_cursor(cursor)
+    return {"$or": [{field: {op: value}}, {field: value, "id": {op: last_id}}]}
+
 # ==================== EMAIL HELPERS ====================
 
-def send_email(to_email: str, subject: str, content: str):
-    if not SENDGRID_API_KEY or SENDGRID_API_KEY == "your_sendgrid_api_key_here":
-        logger.warning("SendGrid API key not configured, skipping email")
-        return False
+def sendgrid_configured() -> bool:
+    return bool(SENDGRID_API_KEY) and SENDGRID_API_KEY != "your_sendgrid_api_key_here"
+
+async def post_mail(personalizations: List[dict], subject: str, content: str) -> bool:
+    payload = {
+        "personalizations": personalizations,
+        "from": {"email": SENDER_EMAIL},
+        "subject": subject,
+        "content": [{"type": "text/html", "value": content}]
+    }
     try:
-        message = Mail(
-            from_email=SENDER_EMAIL,
-            to_emails=to_email,
-            subject=subject,
-            html_content=content
+        response = await http_client.post(
+            SENDGRID_SEND_URL,
+            json=payload,
+            headers={"Authorization": f"Bearer {SENDGRID_API_KEY}"}
         )
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
         return response.status_code == 202
-    except Exception as e:
+    except httpx.HTTPError as e:
         logger.error(f"Failed to send email: {e}")
         return False
 
-def send_maintenance_reminder(user_email: str, user_name: str, car_name: str, task_type: str, due_info: str):
+async def send_email(to_email: str, subject: str, content: str):
+    if not sendgrid_configured():
+        logger.warning("SendGrid API key not configured, skipping email")
+        return False
+    return await post_mail([{"to": [{"email": to_email}]}], subject, content)
+
+def chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+# Identical messages are coalesced into one request with up to 1000
+# personalizations; distinct ones are sent concurrently in chunks of 200
+async def send_reminders_bulk(reminders: List[dict]) -> int:
+    if not sendgrid_configured():
+        logger.warning("SendGrid API key not configured, skipping email")
+        return 0
+    
+    groups = {}
+    for reminder in reminders:
+        groups.setdefault((reminder["subject"], reminder["content"]), []).append(reminder["to_email"])
+    
+    sent = 0
+    singles = []
+    for (subject, content), recipients in groups.items():
+        if len(recipients) == 1:
+            singles.append({"to_email": recipients[0], "subject": subject, "content": content})
+            continue
+        for batch in chunks(recipients, 1000):
+            personalizations = [{"to": [{"email": email}]} for email in batch]
+            if await post_mail(personalizations, subject, content):
+                sent += len(batch)
+    
+    for batch in chunks(singles, 200):
+        results = await asyncio.gather(*[send_email(**r) for r in batch])
+        sent += sum(results)
+    return sent
+
+def build_maintenance_reminder(user_name: str, car_name: str, task_type: str, due_info: str) -> tuple:
     subject = f"AutoTrack: {task_type.replace('_', ' ').title()} Due for {car_name}"
     content = f"""
     <html>
@@ -244,11 +441,15 @@ def send_maintenance_reminder(user_email: str, user_name: str, car_name: str, ta
         </body>
     </html>
     """
-    return send_email(user_email, subject, content)
+    return subject, content
+
+async def send_maintenance_reminder(user_email: str, user_name: str, car_name: str, task_type: str, due_info: str):
+    subject, content = build_maintenance_reminder(user_name, car_name, task_type, due_info)
+    return await send_email(user_email, subject, content)
 
 # ==================== MAINTENANCE STATUS HELPER ====================
 
-def calculate_maintenance_status(task: dict, car_mileage: int) -> tuple:
+def calculate_maintenance_status(task: dict, car_mileage: int, now: Optional[datetime] = None) -> tuple:
     status = "good"
     next_due_mileage = None
     next_due_date = None
@@ -265,32 +466,51 @@ def calculate_maintenance_status(task: dict, car_mileage: int) -> tuple:
                 status = "due_soon"
         
         if task.get("last_performed_date"):
+            now = now or datetime.now(timezone.utc)
             try:
-                last_date = datetime.fromisoformat(task["last_performed_date"].replace('Z', '+00:00'))
-                next_due_date = (last_date + timedelta(days=task["interval_months"] * 30)).isoformat()
-                if datetime.now(timezone.utc) >= datetime.fromisoformat(next_due_date.replace('Z', '+00:00')):
+                last_date = _parse_dt(task["last_performed_date"])
+                next_due_dt = last_date + timedelta(days=task["interval_months"] * 30)
+                next_due_date = next_due_dt.isoformat()
+                if now >= next_due_dt:
                     status = "overdue"
-                elif datetime.now(timezone.utc) >= datetime.fromisoformat(next_due_date.replace('Z', '+00:00')) - timedelta(days=14):
+                elif now >= next_due_dt - timedelta(days=14):
                     status = "due_soon" if status != "overdue" else "overdue"
             except:
                 pass
     
     return status, next_due_mileage, next_due_date
 
+def apply_maintenance_status(task: dict, car_mileage: int, now: Optional[datetime] = None) -> dict:
+    status, next_due_mileage, next_due_date = calculate_maintenance_status(task, car_mileage, now)
+    task["status"] = status
+    task["next_due_mileage"] = next_due_mileage
+    task["next_due_date"] = next_due_date
+    return task
+
+async def update_task_with_status(task_id: str, user_id: str, update_data: dict) -> MaintenanceTaskResponse:
+    task = await db.maintenance_tasks.find_one_and_update(
+        {"id": task_id, "user_id": user_id},
+        {"$set": update_data},
+        projection=TASK_PROJ,
+        return_document=ReturnDocument.AFTER
+    )
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    await invalidate_dashboard_stats(user_id)
+    
+    car = await db.cars.find_one({"id": task["car_id"]}, CAR_MILEAGE_PROJ)
+    car_mileage = car.get("current_mileage", 0) if car else 0
+    return MaintenanceTaskResponse(**apply_maintenance_status(task, car_mileage))
+
 # ==================== AUTH ROUTES ====================
 
-@api_router.post("/auth/register", response_model=TokenResponse)
-async def register(user_data: UserCreate):
-    existing = await db.users.find_one({"email": user_data.email})
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
+async def insert_user(user_data: UserCreate) -> dict:
     user_id = str(uuid.uuid4())
     user_doc = {
         "id": user_id,
         "email": user_data.email,
         "name": user_data.name,
-        "password_hash": hash_password(user_data.password),
+        "password_hash": await hash_password(user_data.password),
         "created_at": datetime.now(timezone.utc).isoformat(),
         "settings": {
             "email_reminders": True,
@@ -299,19 +519,63 @@ async def register(user_data: UserCreate):
             "theme": "light"
         }
     }
-    await db.users.insert_one(user_doc)
-    
-    token = create_token(user_id, user_data.email)
+    # Uniqueness is enforced by the users.email index, saving a lookup round trip
+    try:
+        await db.users.insert_one(user_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    return user_doc
+
+def token_response(user_doc: dict) -> TokenResponse:
     return TokenResponse(
-        access_token=token,
-        user=UserResponse(id=user_id, email=user_data.email, name=user_data.name, created_at=user_doc["created_at"])
+        access_token=create_token(user_doc["id"], user_doc["email"]),
+        user=UserResponse(id=user_doc["id"], email=user_doc["email"], name=user_doc["name"], created_at=user_doc["created_at"])
     )
 
+@api_router.post("/auth/register", response_model=TokenResponse)
+async def register(user_data: UserCreate):
+    return token_response(await insert_user(user_data))
+
+def get_client_ip(request: Request) -> str:
+    peer = request.client.host if request.client else "unknown"
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded or not ("*" in FORWARDED_ALLOW_IPS or peer in FORWARDED_ALLOW_IPS):
+        return peer
+    # Each proxy appends the address it saw, so read from the right and skip our own
+    # proxies; entries further left are supplied by the client and can be forged
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if hop not in FORWARDED_ALLOW_IPS:
+            return hop
+    return hops[0] if hops else peer
+
 @api_router.post("/auth/login", response_model=TokenResponse)
-async def login(credentials: UserLogin):
-    user = await db.users.find_one({"email": credentials.email}, {"_id": 0})
-    if not user or not verify_password(credentials.password, user["password_hash"]):
-        raise HTTPException(status_code=401, detail="Invalid email or password")
+async def login(credentials: UserLogin, request: Request):
+    client_ip = get_client_ip(request)
+    slots = _login_slots.get(client_ip)
+    if slots is None:
+        slots = _login_slots[client_ip] = [asyncio.Semaphore(LOGIN_CONCURRENCY_PER_IP), 0]
+    if slots[0].locked():
+        raise HTTPException(status_code=429, detail="Too many login attempts", headers={"Retry-After": "1"})
+    
+    slots[1] += 1
+    try:
+        async with slots[0]:
+            user = await db.users.find_one({"email": credentials.email}, LOGIN_PROJ)
+            if not user:
+                raise HTTPException(status_code=401, detail="Invalid email or password")
+            
+            failed_key = (user["password_hash"], hashlib.sha256(credentials.password.encode()).digest())
+            if failed_key in _failed_logins:
+                await asyncio.sleep(FAILED_LOGIN_DELAY_SECONDS)
+                raise HTTPException(status_code=401, detail="Invalid email or password")
+            if not await verify_password(credentials.password, user["password_hash"]):
+                _failed_logins[failed_key] = True
+                raise HTTPException(status_code=401, detail="Invalid email or password")
+    finally:
+        slots[1] -= 1
+        if slots[1] == 0:
+            del _login_slots[client_ip]
     
     token = create_token(user["id"], user["email"])
     return TokenResponse(
@@ -330,26 +594,30 @@ async def get_me(current_user: dict = Depends(get_current_user)):
 
 # ==================== CAR ROUTES ====================
 
-@api_router.post("/cars", response_model=CarResponse)
-async def create_car(car_data: CarCreate, current_user: dict = Depends(get_current_user)):
-    car_id = str(uuid.uuid4())
+async def insert_car(car_data: CarCreate, user_id: str) -> CarResponse:
     car_doc = {
-        "id": car_id,
-        "user_id": current_user["id"],
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
         **car_data.model_dump(),
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.cars.insert_one(car_doc)
     return CarResponse(**{k: v for k, v in car_doc.items() if k != "_id"})
 
+@api_router.post("/cars", response_model=CarResponse)
+async def create_car(car_data: CarCreate, current_user: dict = Depends(get_current_user)):
+    car = await insert_car(car_data, current_user["id"])
+    await invalidate_dashboard_stats(current_user["id"])
+    return car
+
 @api_router.get("/cars", response_model=List[CarResponse])
 async def get_cars(current_user: dict = Depends(get_current_user)):
-    cars = await db.cars.find({"user_id": current_user["id"]}, {"_id": 0}).to_list(100)
-    return [CarResponse(**car) for car in cars]
+    cars = await db.cars.find({"user_id": current_user["id"]}, CAR_PROJ).to_list(100)
+    return ORJSONResponse(cars)
 
 @api_router.get("/cars/{car_id}", response_model=CarResponse)
 async def get_car(car_id: str, current_user: dict = Depends(get_current_user)):
-    car = await db.cars.find_one({"id": car_id, "user_id": current_user["id"]}, {"_id": 0})
+    car = await db.cars.find_one({"id": car_id, "user_id": current_user["id"]}, CAR_PROJ)
     if not car:
         raise HTTPException(status_code=404, detail="Car not found")
     return CarResponse(**car)
@@ -360,14 +628,16 @@ async def update_car(car_id: str, car_data: CarUpdate, current_user: dict = Depe
     if not update_data:
         raise HTTPException(status_code=400, detail="No data to update")
     
-    result = await db.cars.update_one(
+    car = await db.cars.find_one_and_update(
         {"id": car_id, "user_id": current_user["id"]},
-        {"$set": update_data}
+        {"$set": update_data},
+        projection=CAR_PROJ,
+        return_document=ReturnDocument.AFTER
     )
-    if result.matched_count == 0:
+    if not car:
         raise HTTPException(status_code=404, detail="Car not found")
+    await invalidate_dashboard_stats(current_user["id"])
     
-    car = await db.cars.find_one({"id": car_id}, {"_id": 0})
     return CarResponse(**car)
 
 @api_router.delete("/cars/{car_id}")
@@ -379,26 +649,21 @@ async def delete_car(car_id: str, current_user: dict = Depends(get_current_user)
     # Also delete related maintenance tasks and mileage logs
     await db.maintenance_tasks.delete_many({"car_id": car_id})
     await db.mileage_logs.delete_many({"car_id": car_id})
+    await invalidate_dashboard_stats(current_user["id"])
     
     return {"message": "Car deleted successfully"}
 
 # ==================== MAINTENANCE ROUTES ====================
 
-@api_router.post("/maintenance", response_model=MaintenanceTaskResponse)
-async def create_maintenance_task(task_data: MaintenanceTaskCreate, current_user: dict = Depends(get_current_user)):
-    car = await db.cars.find_one({"id": task_data.car_id, "user_id": current_user["id"]})
-    if not car:
-        raise HTTPException(status_code=404, detail="Car not found")
-    
-    task_id = str(uuid.uuid4())
+async def insert_maintenance_task(task_data: MaintenanceTaskCreate, user_id: str, car_mileage: int) -> MaintenanceTaskResponse:
     task_doc = {
-        "id": task_id,
-        "user_id": current_user["id"],
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
         **task_data.model_dump(),
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     
-    status, next_due_mileage, next_due_date = calculate_maintenance_status(task_doc, car.get("current_mileage", 0))
+    status, next_due_mileage, next_due_date = calculate_maintenance_status(task_doc, car_mileage)
     task_doc["status"] = status
     task_doc["next_due_mileage"] = next_due_mileage
     task_doc["next_due_date"] = next_due_date
@@ -406,34 +671,64 @@ async def create_maintenance_task(task_data: MaintenanceTaskCreate, current_user
     await db.maintenance_tasks.insert_one(task_doc)
     return MaintenanceTaskResponse(**{k: v for k, v in task_doc.items() if k != "_id"})
 
+@api_router.post("/maintenance", response_model=MaintenanceTaskResponse)
+async def create_maintenance_task(task_data: MaintenanceTaskCreate, current_user: dict = Depends(get_current_user)):
+    car = await db.cars.find_one({"id": task_data.car_id, "user_id": current_user["id"]}, CAR_MILEAGE_PROJ)
+    if not car:
+        raise HTTPException(status_code=404, detail="Car not found")
+    
+    task = await insert_maintenance_task(task_data, current_user["id"], car.get("current_mileage", 0))
+    await invalidate_dashboard_stats(current_user["id"])
+    return task
+
 @api_router.get("/maintenance", response_model=List[MaintenanceTaskResponse])
-async def get_maintenance_tasks(car_id: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+async def get_maintenance_tasks(
+    car_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: dict = Depends(get_current_user)
+):
     query = {"user_id": current_user["id"]}
     if car_id:
         query["car_id"] = car_id
-    
-    tasks = await db.maintenance_tasks.find(query, {"_id": 0}).to_list(500)
-    
-    # Update status for each task
-    result = []
+    if cursor:
+        query.update(keyset_filter("created_at", cursor, "$gt"))
+    
+    # Join each task to its car's mileage on the server so the listing is a single round trip
+    results = await db.maintenance_tasks.aggregate([
+        {"$match": query},
+        {"$sort": {"created_at": 1, "id": 1}},
+        {"$limit": limit},
+        # Only current_mileage is joined; car documents can carry large base64 images
+        {"$lookup": {
+            "from": "cars",
+            "localField": "car_id",
+            "foreignField": "id",
+            "pipeline": [{"$project": CAR_MILEAGE_PROJ}],
+            "as": "car"
+        }},
+        {"$project": {
+            **TASK_PROJ,
+            "car_mileage": {"$ifNull": [{"$arrayElemAt": ["$car.current_mileage", 0]}, 0]}
+        }}
+    ])
+    tasks = await results.to_list(limit)
+    headers = None
+    if len(tasks) == limit:
+        headers = {NEXT_CURSOR_HEADER: encode_cursor(tasks[-1]["created_at"], tasks[-1]["id"])}
+    now = datetime.now(timezone.utc)
     for task in tasks:
-        car = await db.cars.find_one({"id": task["car_id"]}, {"_id": 0})
-        car_mileage = car.get("current_mileage", 0) if car else 0
-        status, next_due_mileage, next_due_date = calculate_maintenance_status(task, car_mileage)
-        task["status"] = status
-        task["next_due_mileage"] = next_due_mileage
-        task["next_due_date"] = next_due_date
-        result.append(MaintenanceTaskResponse(**task))
+        apply_maintenance_status(task, task.pop("car_mileage"), now)
     
-    return result
+    return ORJSONResponse(tasks, headers=headers)
 
 @api_router.get("/maintenance/{task_id}", response_model=MaintenanceTaskResponse)
 async def get_maintenance_task(task_id: str, current_user: dict = Depends(get_current_user)):
-    task = await db.maintenance_tasks.find_one({"id": task_id, "user_id": current_user["id"]}, {"_id": 0})
+    task = await db.maintenance_tasks.find_one({"id": task_id, "user_id": current_user["id"]}, TASK_PROJ)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    car = await db.cars.find_one({"id": task["car_id"]}, {"_id": 0})
+    car = await db.cars.find_one({"id": task["car_id"]}, CAR_MILEAGE_PROJ)
     car_mileage = car.get("current_mileage", 0) if car else 0
     status, next_due_mileage, next_due_date = calculate_maintenance_status(task, car_mileage)
     task["status"] = status
@@ -448,36 +743,18 @@ async def update_maintenance_task(task_id: str, task_data: MaintenanceTaskUpdate
     if not update_data:
         raise HTTPException(status_code=400, detail="No data to update")
     
-    result = await db.maintenance_tasks.update_one(
-        {"id": task_id, "user_id": current_user["id"]},
-        {"$set": update_data}
-    )
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    task = await db.maintenance_tasks.find_one({"id": task_id}, {"_id": 0})
-    car = await db.cars.find_one({"id": task["car_id"]}, {"_id": 0})
-    car_mileage = car.get("current_mileage", 0) if car else 0
-    status, next_due_mileage, next_due_date = calculate_maintenance_status(task, car_mileage)
-    task["status"] = status
-    task["next_due_mileage"] = next_due_mileage
-    task["next_due_date"] = next_due_date
-    
-    return MaintenanceTaskResponse(**task)
+    return await update_task_with_status(task_id, current_user["id"], update_data)
 
 @api_router.delete("/maintenance/{task_id}")
 async def delete_maintenance_task(task_id: str, current_user: dict = Depends(get_current_user)):
     result = await db.maintenance_tasks.delete_one({"id": task_id, "user_id": current_user["id"]})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Task not found")
+    await invalidate_dashboard_stats(current_user["id"])
     return {"message": "Task deleted successfully"}
 
 @api_router.post("/maintenance/{task_id}/complete", response_model=MaintenanceTaskResponse)
 async def complete_maintenance_task(task_id: str, mileage: int, current_user: dict = Depends(get_current_user)):
-    task = await db.maintenance_tasks.find_one({"id": task_id, "user_id": current_user["id"]})
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
     now = datetime.now(timezone.utc).isoformat()
     update_data = {
         "last_performed_date": now,
@@ -486,78 +763,53 @@ async def complete_maintenance_task(task_id: str, mileage: int, current_user: di
         "replacement_reason": None
     }
     
-    await db.maintenance_tasks.update_one({"id": task_id}, {"$set": update_data})
+    task = await db.maintenance_tasks.find_one_and_update(
+        {"id": task_id, "user_id": current_user["id"]},
+        {"$set": update_data},
+        projection=TASK_PROJ,
+        return_document=ReturnDocument.AFTER
+    )
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
     
-    # Update car's current mileage if higher
-    await db.cars.update_one(
-        {"id": task["car_id"], "current_mileage": {"$lt": mileage}},
-        {"$set": {"current_mileage": mileage}}
+    # Update car's current mileage if higher, reading back the result in the same round trip
+    car = await db.cars.find_one_and_update(
+        {"id": task["car_id"]},
+        {"$max": {"current_mileage": mileage}},
+        projection=CAR_MILEAGE_PROJ,
+        return_document=ReturnDocument.AFTER
     )
+    await invalidate_dashboard_stats(current_user["id"])
     
-    task = await db.maintenance_tasks.find_one({"id": task_id}, {"_id": 0})
-    car = await db.cars.find_one({"id": task["car_id"]}, {"_id": 0})
     car_mileage = car.get("current_mileage", 0) if car else 0
-    status, next_due_mileage, next_due_date = calculate_maintenance_status(task, car_mileage)
-    task["status"] = status
-    task["next_due_mileage"] = next_due_mileage
-    task["next_due_date"] = next_due_date
-    
-    return MaintenanceTaskResponse(**task)
+    return MaintenanceTaskResponse(**apply_maintenance_status(task, car_mileage))
 
 class ReplacementRequest(BaseModel):
     reason: str
 
 @api_router.post("/maintenance/{task_id}/request-replacement", response_model=MaintenanceTaskResponse)
 async def request_replacement(task_id: str, request: ReplacementRequest, current_user: dict = Depends(get_current_user)):
-    task = await db.maintenance_tasks.find_one({"id": task_id, "user_id": current_user["id"]})
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
     update_data = {
         "replacement_requested": True,
         "replacement_reason": request.reason
     }
     
-    await db.maintenance_tasks.update_one({"id": task_id}, {"$set": update_data})
-    
-    task = await db.maintenance_tasks.find_one({"id": task_id}, {"_id": 0})
-    car = await db.cars.find_one({"id": task["car_id"]}, {"_id": 0})
-    car_mileage = car.get("current_mileage", 0) if car else 0
-    status, next_due_mileage, next_due_date = calculate_maintenance_status(task, car_mileage)
-    task["status"] = status
-    task["next_due_mileage"] = next_due_mileage
-    task["next_due_date"] = next_due_date
-    
-    return MaintenanceTaskResponse(**task)
+    return await update_task_with_status(task_id, current_user["id"], update_data)
 
 @api_router.post("/maintenance/{task_id}/cancel-replacement", response_model=MaintenanceTaskResponse)
 async def cancel_replacement(task_id: str, current_user: dict = Depends(get_current_user)):
-    task = await db.maintenance_tasks.find_one({"id": task_id, "user_id": current_user["id"]})
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
     update_data = {
         "replacement_requested": False,
         "replacement_reason": None
     }
     
-    await db.maintenance_tasks.update_one({"id": task_id}, {"$set": update_data})
-    
-    task = await db.maintenance_tasks.find_one({"id": task_id}, {"_id": 0})
-    car = await db.cars.find_one({"id": task["car_id"]}, {"_id": 0})
-    car_mileage = car.get("current_mileage", 0) if car else 0
-    status, next_due_mileage, next_due_date = calculate_maintenance_status(task, car_mileage)
-    task["status"] = status
-    task["next_due_mileage"] = next_due_mileage
-    task["next_due_date"] = next_due_date
-    
-    return MaintenanceTaskResponse(**task)
+    return await update_task_with_status(task_id, current_user["id"], update_data)
 
 # ==================== MILEAGE ROUTES ====================
 
 @api_router.post("/mileage", response_model=MileageLogResponse)
 async def log_mileage(log_data: MileageLogCreate, current_user: dict = Depends(get_current_user)):
-    car = await db.cars.find_one({"id": log_data.car_id, "user_id": current_user["id"]})
+    car = await db.cars.find_one({"id": log_data.car_id, "user_id": current_user["id"]}, CAR_MILEAGE_PROJ)
     if not car:
         raise HTTPException(status_code=404, detail="Car not found")
     
@@ -575,16 +827,28 @@ async def log_mileage(log_data: MileageLogCreate, current_user: dict = Depends(g
     # Update car's current mileage
     if log_data.mileage > car.get("current_mileage", 0):
         await db.cars.update_one({"id": log_data.car_id}, {"$set": {"current_mileage": log_data.mileage}})
+        await invalidate_dashboard_stats(current_user["id"])
     
     return MileageLogResponse(**{k: v for k, v in log_doc.items() if k != "_id"})
 
 @api_router.get("/mileage/{car_id}", response_model=List[MileageLogResponse])
-async def get_mileage_logs(car_id: str, current_user: dict = Depends(get_current_user)):
-    logs = await db.mileage_logs.find(
-        {"car_id": car_id, "user_id": current_user["id"]},
-        {"_id": 0}
-    ).sort("date", -1).to_list(500)
-    return [MileageLogResponse(**log) for log in logs]
+async def get_mileage_logs(
+    car_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: dict = Depends(get_current_user)
+):
+    query = {"car_id": car_id, "user_id": current_user["id"]}
+    if cursor:
+        query.update(keyset_filter("date", cursor, "$lt"))
+    
+    logs = await db.mileage_logs.find(query, MILEAGE_LOG_PROJ).sort(
+        [("date", -1), ("id", -1)]
+    ).limit(limit).to_list(limit)
+    headers = None
+    if len(logs) == limit:
+        headers = {NEXT_CURSOR_HEADER: encode_cursor(logs[-1]["date"], logs[-1]["id"])}
+    return ORJSONResponse(logs, headers=headers)
 
 # ==================== NOTIFICATIONS ====================
 
@@ -592,9 +856,9 @@ async def get_mileage_logs(car_id: str, current_user: dict = Depends(get_current
 async def get_notifications(current_user: dict = Depends(get_current_user)):
     notifications = await db.notifications.find(
         {"user_id": current_user["id"]},
-        {"_id": 0}
+        NOTIFICATION_PROJ
     ).sort("created_at", -1).to_list(50)
-    return [NotificationResponse(**n) for n in notifications]
+    return ORJSONResponse(notifications)
 
 @api_router.put("/notifications/{notification_id}/read")
 async def mark_notification_read(notification_id: str, current_user: dict = Depends(get_current_user)):
@@ -617,7 +881,8 @@ async def delete_notification(notification_id: str, current_user: dict = Depends
 
 @api_router.get("/settings")
 async def get_settings(current_user: dict = Depends(get_current_user)):
-    return current_user.get("settings", {
+    user = await db.users.find_one({"id": current_user["id"]}, SETTINGS_PROJ) or {}
+    return user.get("settings", {
         "email_reminders": True,
         "push_notifications": True,
         "reminder_days_before": 7,
@@ -631,24 +896,37 @@ async def update_settings(settings: ReminderSettingsUpdate, current_user: dict =
         raise HTTPException(status_code=400, detail="No data to update")
     
     await db.users.update_one({"id": current_user["id"]}, {"$set": update_data})
-    user = await db.users.find_one({"id": current_user["id"]}, {"_id": 0})
+    user = await db.users.find_one({"id": current_user["id"]}, SETTINGS_PROJ)
     return user.get("settings", {})
 
 # ==================== DASHBOARD STATS ====================
 
 @api_router.get("/dashboard/stats")
 async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
-    cars = await db.cars.find({"user_id": current_user["id"]}, {"_id": 0}).to_list(100)
-    tasks = await db.maintenance_tasks.find({"user_id": current_user["id"]}, {"_id": 0}).to_list(500)
+    cache_key = dashboard_stats_key(current_user["id"])
+    if redis_client:
+        try:
+            cached = await redis_client.get(cache_key)
+            if cached:
+                return orjson.loads(cached)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read cached dashboard stats: {e}")
+    
+    cars, tasks = await asyncio.gather(
+        db.cars.find({"user_id": current_user["id"]}, {"_id": 0, "id": 1, "current_mileage": 1}).to_list(100),
+        db.maintenance_tasks.find({"user_id": current_user["id"]}, TASK_STATUS_PROJ).to_list(500)
+    )
     
     overdue_count = 0
     due_soon_count = 0
     good_count = 0
     
+    cars_by_id = {c["id"]: c for c in cars}
+    now = datetime.now(timezone.utc)
     for task in tasks:
-        car = next((c for c in cars if c["id"] == task["car_id"]), None)
+        car = cars_by_id.get(task["car_id"])
         car_mileage = car.get("current_mileage", 0) if car else 0
-        status, _, _ = calculate_maintenance_status(task, car_mileage)
+        status, _, _ = calculate_maintenance_status(task, car_mileage, now)
         if status == "overdue":
             overdue_count += 1
         elif status == "due_soon":
@@ -656,13 +934,41 @@ async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
         else:
             good_count += 1
     
-    return {
+    stats = {
         "total_cars": len(cars),
         "total_tasks": len(tasks),
         "overdue": overdue_count,
         "due_soon": due_soon_count,
         "good": good_count
     }
+    if redis_client:
+        try:
+            await redis_client.setex(cache_key, DASHBOARD_STATS_TTL_SECONDS, orjson.dumps(stats))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to cache dashboard stats: {e}")
+    return stats
+
+# ==================== BOOTSTRAP ====================
+
+# Onboarding in one round trip: register, add the first car and optionally its first task.
+# Runs without a transaction (those need a replica set), so a failure after the user is
+# created rolls back the documents by hand.
+@api_router.post("/bootstrap", response_model=BootstrapResponse)
+async def bootstrap(data: BootstrapRequest):
+    user_doc = await insert_user(data.user)
+    try:
+        car = await insert_car(data.car, user_doc["id"])
+        task = None
+        if data.task:
+            data.task.car_id = car.id
+            task = await insert_maintenance_task(data.task, user_doc["id"], car.current_mileage)
+    except Exception:
+        await db.maintenance_tasks.delete_many({"user_id": user_doc["id"]})
+        await db.cars.delete_many({"user_id": user_doc["id"]})
+        await db.users.delete_one({"id": user_doc["id"]})
+        raise
+    
+    return BootstrapResponse(**token_response(user_doc).model_dump(), car=car, task=task)
 
 # ==================== HEALTH CHECK ====================
 
@@ -683,8 +989,35 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+@app.on_event("startup")
+async def ensure_indexes():
+    await db.users.create_index("email", unique=True)
+    await db.users.create_index("id", unique=True)
+    await db.cars.create_index("id", unique=True)
+    await db.cars.create_index([("user_id", 1), ("id", 1)])
+    await db.maintenance_tasks.create_index("id", unique=True)
+    await db.maintenance_tasks.create_index([("user_id", 1), ("car_id", 1)])
+    await db.maintenance_tasks.create_index([("car_id", 1)])
+    await db.maintenance_tasks.create_index([("user_id", 1), ("created_at", 1), ("id", 1)])
+    await db.mileage_logs.create_index([("car_id", 1), ("user_id", 1), ("date", -1), ("id", -1)])
+    await db.notifications.create_index([("user_id", 1), ("created_at", -1)])
+
+@app.on_event("startup")
+async def configure_bcrypt():
+    global bcrypt_rounds
+    if BCRYPT_COST:
+        bcrypt_rounds = int(BCRYPT_COST)
+    else:
+        bcrypt_rounds = await asyncio.get_running_loop().run_in_executor(bcrypt_pool, calibrate_bcrypt_rounds)
+    logger.info(f"Using bcrypt cost {bcrypt_rounds}")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    await client.close()
+    await http_client.aclose()
+    if redis_client:
+        await redis_client.aclose()
+    bcrypt_pool.shutdown(wait=False)
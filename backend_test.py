@@ -1,258 +1,507 @@
 #!/usr/bin/env python3
 
-import requests
+import argparse
+import asyncio
+import base64
+import collections
+import contextlib
+import httpx
+import logging
+import logging.handlers
+import numpy as np
+import orjson
+import queue
 import sys
 import time
-from datetime import datetime
+import uuid
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+DEFAULT_BASE_URL = "https://fleet-health-3.preview.emergentagent.com/api"
+
+logger = logging.getLogger('autotrack')
+
+TEST_PASSWORD = "TestPass123!"
+TEST_CAR = {
+    "make": "Toyota",
+    "model": "Camry",
+    "year": 2020,
+    "color": "Silver",
+    "license_plate": "TEST123",
+    "current_mileage": 50000
+}
+TEST_TASK = {
+    "task_type": "oil_change",
+    "description": "Regular oil change",
+    "last_performed_mileage": 45000,
+    "interval_miles": 5000,
+    "interval_months": 6,
+    "notes": "Full synthetic oil"
+}
+
+# Whole-request deadlines in seconds; the AI chat waits on an LLM, everything else is CRUD
+ENDPOINT_TIMEOUTS = {"chat": 30}
+DEFAULT_TIMEOUT = 5
+CONNECT_TIMEOUT = 3.05
+
+# Response header carrying the keyset cursor for the next page of a listing
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Initial size of each tester's per-request status array; it grows if a run needs more
+REQUEST_CAPACITY = 32
+# Latency samples kept for the report; long runs keep only the most recent ones
+LATENCY_SAMPLES = 100_000
+
+# Request bodies are serialized once at import; per-run values are filled into
+# the "__NAME__" placeholders with fill_body instead of re-encoding whole dicts
+TEST_USER = {"email": "__EMAIL__", "password": TEST_PASSWORD, "name": "Test User"}
+REGISTER_BODY = orjson.dumps(TEST_USER)
+BOOTSTRAP_BODY = orjson.dumps({"user": TEST_USER, "car": TEST_CAR, "task": TEST_TASK})
+CAR_BODY = orjson.dumps(TEST_CAR)
+TASK_BODY = orjson.dumps({"car_id": "__CAR_ID__", **TEST_TASK})
+MILEAGE_BODY = orjson.dumps({"car_id": "__CAR_ID__", "mileage": "__MILEAGE__", "notes": "Highway trip"})
+CHAT_BODY = orjson.dumps({"message": "What should I check if my car won't start?", "car_id": "__CAR_ID__"})
+SETTINGS_BODY = orjson.dumps({"email_reminders": True, "push_notifications": False, "reminder_days_before": 14})
+
+def fill_body(body, **values):
+    """Replace each "__NAME__" placeholder in a pre-serialized body with the JSON encoding of its value"""
+    for name, value in values.items():
+        body = body.replace(f'"__{name.upper()}__"'.encode(), orjson.dumps(value))
+    return body
+
+def new_test_email():
+    """Build a fresh, unique email address for registration"""
+    timestamp = int(time.time())
+    return f"test_user_{timestamp}_{uuid.uuid4().hex[:8]}@example.com"
+
+def configure_logging(quiet=False):
+    """Send log records through a queue so console writes happen off the event loop thread"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', datefmt='%H:%M:%S'))
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.WARNING if quiet else logging.INFO)
+    logger.propagate = False
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+def create_client(base_url=DEFAULT_BASE_URL):
+    """Create the shared HTTP client; over HTTPS concurrent requests multiplex on one HTTP/2 connection"""
+    # The transport retries failed connection attempts, not requests that reached the server
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=2,
+        # No cap on concurrent connections; --users and --max-concurrency bound the load
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=20)
+    )
+    return httpx.AsyncClient(
+        base_url=base_url,
+        headers={'Content-Type': 'application/json'},
+        transport=transport
+    )
+
+class LatencyRing:
+    """Fixed-size ring buffer of (endpoint id, elapsed ns) samples, shared by all testers in a run"""
+
+    def __init__(self, size=LATENCY_SAMPLES):
+        self.samples = np.empty((size, 2), dtype=np.int64)
+        self.count = 0
+        self.endpoint_ids = {}
+
+    def record(self, endpoint, elapsed_ns):
+        endpoint_id = self.endpoint_ids.setdefault(endpoint, len(self.endpoint_ids))
+        self.samples[self.count % len(self.samples)] = (endpoint_id, elapsed_ns)
+        self.count += 1
+
+    def report(self):
+        """Log overall and per-endpoint latency percentiles, slowest p99 first, at the summary's WARNING level"""
+        samples = self.samples[:min(self.count, len(self.samples))]
+        if len(samples) < 2:
+            return
+        p50, p95, p99 = np.percentile(samples[:, 1], [50, 95, 99]) / 1e6
+        logger.warning("\n⏱️  %d requests - p50: %.1f ms, p95: %.1f ms, p99: %.1f ms", len(samples), p50, p95, p99)
+
+        rows = []
+        for endpoint, endpoint_id in self.endpoint_ids.items():
+            elapsed = samples[samples[:, 0] == endpoint_id, 1]
+            if len(elapsed):
+                rows.append((endpoint, len(elapsed), *np.percentile(elapsed, [50, 90, 95, 99]) / 1e6))
+        width = max(len(row[0]) for row in rows)
+        for endpoint, n, p50, p90, p95, p99 in sorted(rows, key=lambda row: row[-1], reverse=True):
+            logger.warning("   %-*s  n=%-6d p50: %7.1f  p90: %7.1f  p95: %7.1f  p99: %7.1f ms",
+                           width, endpoint, n, p50, p90, p95, p99)
 
 class AutoTrackAPITester:
-    def __init__(self, base_url="https://fleet-health-3.preview.emergentagent.com/api"):
+    def __init__(self, client, base_url=DEFAULT_BASE_URL, request_slots=None, deep=False, bootstrap=False, latency=None):
+        self.client = client
         self.base_url = base_url
+        # deep re-checks over the network what earlier responses already proved
+        self.deep = deep
+        # bootstrap creates the user, car and task with one request instead of three in sequence
+        self.bootstrap = bootstrap
         self.token = None
         self.user_id = None
-        self.tests_run = 0
-        self.tests_passed = 0
+        self.user_profile = None
+        self.logger = logger
+        # Content-Type lives on the shared client; the auth headers are built once the token is known
+        self._base_headers = {}
+        self._auth_headers = None
+        # Per-request results, one slot per run_test call: 1 passed, -1 failed
+        self.requests_run = 0
+        self.status = np.zeros(REQUEST_CAPACITY, dtype=np.int8)
+        # Latency samples per test name; may be shared between testers
+        self.latency = latency if latency is not None else LatencyRing()
         self.test_car_id = None
         self.test_task_id = None
+        # Relative paths for the created car and task, built once when their ids arrive
+        self.car_path = None
+        self.car_mileage_path = None
+        self.task_complete_path = None
+        # Optional semaphore capping in-flight requests, shared by all testers, for servers that rate-limit
+        self.request_slots = request_slots
+        # Tasks for the tests that create the user, car and task; dependent tests await them
+        self.registered = None
+        self.car_created = None
+        self.task_created = None
+
+    @property
+    def tests_run(self):
+        return self.requests_run
+
+    @property
+    def tests_passed(self):
+        return int((self.status == 1).sum())
+
+    def next_request_slot(self):
+        """Claim the next slot in the status array, marked failed until the request passes"""
+        i = self.requests_run
+        if i == len(self.status):
+            self.status = np.concatenate([self.status, np.zeros_like(self.status)])
+        self.requests_run += 1
+        self.status[i] = -1
+        return i
 
-    def log(self, message):
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+    async def stream_counting_body(self, method, endpoint, expected_status, **kwargs):
+        """Send a request and count the body bytes instead of keeping them, unless the status is unexpected"""
+        async with self.client.stream(method, endpoint, **kwargs) as response:
+            if response.status_code != expected_status:
+                await response.aread()
+                return response, None
+            size = 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+            return response, size
 
-    def run_test(self, name, method, endpoint, expected_status, data=None, params=None):
-        """Run a single API test"""
-        url = f"{self.base_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
-        if self.token:
-            headers['Authorization'] = f'Bearer {self.token}'
+    async def run_test(self, name, method, endpoint, expected_status, **kwargs):
+        """Run a single API test; with discard_body a successful result is the body size in bytes"""
+        success, body, _ = await self.run_test_response(name, method, endpoint, expected_status, **kwargs)
+        return success, body
 
-        self.tests_run += 1
-        self.log(f"🔍 Testing {name}...")
+    async def run_test_response(self, name, method, endpoint, expected_status, data=None, params=None, timeout=None,
+                                discard_body=False):
+        """Like run_test but also return the response, or None when the request itself failed"""
+        if timeout is None:
+            timeout = ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+        i = self.next_request_slot()
+        self.logger.info("🔍 Testing %s...", name)
+        # data may be pre-serialized bytes; the shared client already sends Content-Type: application/json
+        payload = data if data is None or isinstance(data, bytes) else orjson.dumps(data)
+        headers = self._auth_headers or self._base_headers
         
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, params=params)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, params=params)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers)
-
-            success = response.status_code == expected_status
-            if success:
-                self.tests_passed += 1
-                self.log(f"✅ {name} - Status: {response.status_code}")
-                try:
-                    return success, response.json() if response.content else {}
-                except:
-                    return success, {}
+            async with self.request_slots or contextlib.nullcontext():
+                start = time.perf_counter_ns()
+                # asyncio.timeout bounds the whole exchange and cancels the request when it expires
+                request_args = dict(content=payload, headers=headers, params=params,
+                                    timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT))
+                async with asyncio.timeout(timeout):
+                    if discard_body:
+                        response, body_size = await self.stream_counting_body(method, endpoint, expected_status, **request_args)
+                    else:
+                        response = await self.client.request(method, endpoint, **request_args)
+                self.latency.record(name, time.perf_counter_ns() - start)
+
+            status_code = response.status_code
+            if discard_body and status_code == expected_status:
+                body = body_size
             else:
-                self.log(f"❌ {name} - Expected {expected_status}, got {response.status_code}")
+                # Decode the body once; empty or non-JSON bodies raise JSONDecodeError
                 try:
-                    error_detail = response.json().get('detail', 'No detail') if response.content else 'No content'
-                    self.log(f"   Error: {error_detail}")
-                except:
-                    self.log(f"   Raw response: {response.text[:200]}")
+                    body = orjson.loads(response.content)
+                except orjson.JSONDecodeError:
+                    body = None
+
+            success = status_code == expected_status
+            if success:
+                self.status[i] = 1
+                self.logger.info("✅ %s - Status: %s", name, response.status_code)
+                return success, {} if body is None else body, response
 
-            return success, {}
+            self.logger.error("❌ %s - Expected %s, got %s", name, expected_status, response.status_code)
+            if isinstance(body, dict):
+                self.logger.error("   Error: %s", body.get('detail', 'No detail'))
+            elif response.headers.get('Content-Length') == '0':
+                self.logger.error("   Error: No content")
+            else:
+                self.logger.error("   Raw response: %.200s", response.text)
+            return success, {}, response
 
-        except Exception as e:
-            self.log(f"❌ {name} - Network Error: {str(e)}")
-            return False, {}
+        except TimeoutError:
+            self.logger.error("❌ %s - Timed out after %ss", name, timeout)
+            return False, {}, None
+        except httpx.HTTPError as e:
+            self.logger.error("❌ %s - Network Error: %s", name, e)
+            return False, {}, None
 
-    def test_health_check(self):
+    async def test_health_check(self):
         """Test API health"""
-        return self.run_test("API Health Check", "GET", "", 200)
+        success, _ = await self.run_test("API Health Check", "GET", "", 200)
+        return success
+
+    def set_user(self, response):
+        """Remember the token and profile from a registration response"""
+        self.token = response['access_token']
+        self._auth_headers = {'Authorization': f'Bearer {self.token}'}
+        self.user_id = response['user']['id']
+        self.user_profile = response['user']
+        self.logger.info("   Registered user: %s", self.user_profile['email'])
 
-    def test_register_user(self):
+    def set_car(self, car_id):
+        """Remember the created car and the paths that address it"""
+        self.test_car_id = car_id
+        self.car_path = f"cars/{car_id}"
+        self.car_mileage_path = f"mileage/{car_id}"
+
+    def set_task(self, task_id):
+        """Remember the created task and the paths that address it"""
+        self.test_task_id = task_id
+        self.task_complete_path = f"maintenance/{task_id}/complete"
+
+    async def test_register_user(self):
         """Test user registration"""
-        timestamp = int(time.time())
-        test_email = f"test_user_{timestamp}@example.com"
-        test_data = {
-            "email": test_email,
-            "password": "TestPass123!",
-            "name": "Test User"
-        }
-        success, response = self.run_test("User Registration", "POST", "auth/register", 200, data=test_data)
+        success, response = await self.run_test("User Registration", "POST", "auth/register", 200,
+                                                 data=fill_body(REGISTER_BODY, email=new_test_email()))
+        if success and 'access_token' in response:
+            self.set_user(response)
+            return True
+        return False
+
+    async def test_bootstrap(self):
+        """Test registering with a first car and task in one request"""
+        data = fill_body(BOOTSTRAP_BODY, email=new_test_email())
+        success, response = await self.run_test("Bootstrap", "POST", "bootstrap", 200, data=data)
         if success and 'access_token' in response:
-            self.token = response['access_token']
-            self.user_id = response['user']['id']
-            self.log(f"   Registered user: {test_email}")
+            self.set_user(response)
+            self.set_car(response['car']['id'])
+            self.set_task(response['task']['id'])
+            self.logger.info("   Created car ID: %s, task ID: %s", self.test_car_id, self.test_task_id)
             return True
         return False
 
-    def test_login_user(self):
+    async def test_login_user(self):
         """Test user login (using same credentials from registration)"""
+        await self.registered
         if not self.token:
-            self.log("❌ Cannot test login - no registered user")
+            self.logger.error("❌ Cannot test login - no registered user")
             return False
         
+        # Registration already returned the token and profile; only re-fetch them in deep mode
+        if not self.deep:
+            self.logger.info("✅ User Authentication - token issued for user %s", self.user_profile['id'])
+            return True
+
         # We'll test with the same user we registered
-        success, _ = self.run_test("Get User Profile", "GET", "auth/me", 200)
+        success, _ = await self.run_test("Get User Profile", "GET", "auth/me", 200)
         return success
 
-    def test_create_car(self):
+    async def test_create_car(self):
         """Test creating a car"""
-        car_data = {
-            "make": "Toyota",
-            "model": "Camry",
-            "year": 2020,
-            "color": "Silver",
-            "license_plate": "TEST123",
-            "current_mileage": 50000
-        }
-        success, response = self.run_test("Create Car", "POST", "cars", 200, data=car_data)
+        await self.registered
+        success, response = await self.run_test("Create Car", "POST", "cars", 200, data=CAR_BODY)
         if success and 'id' in response:
-            self.test_car_id = response['id']
-            self.log(f"   Created car ID: {self.test_car_id}")
+            self.set_car(response['id'])
+            self.logger.info("   Created car ID: %s", self.test_car_id)
             return True
         return False
 
-    def test_get_cars(self):
+    async def test_get_cars(self):
         """Test getting user's cars"""
-        success, response = self.run_test("Get Cars", "GET", "cars", 200)
+        await self.registered
+        success, response = await self.run_test("Get Cars", "GET", "cars", 200)
         if success and isinstance(response, list):
-            self.log(f"   Found {len(response)} cars")
+            self.logger.info("   Found %d cars", len(response))
             return True
         return False
 
-    def test_get_car_details(self):
+    async def test_get_car_details(self):
         """Test getting car details"""
+        await self.car_created
         if not self.test_car_id:
-            self.log("❌ Cannot test car details - no car created")
+            self.logger.error("❌ Cannot test car details - no car created")
             return False
         
-        success, response = self.run_test("Get Car Details", "GET", f"cars/{self.test_car_id}", 200)
+        success, response = await self.run_test("Get Car Details", "GET", self.car_path, 200)
         return success
 
-    def test_create_maintenance_task(self):
+    async def test_create_maintenance_task(self):
         """Test creating maintenance task"""
+        await self.car_created
         if not self.test_car_id:
-            self.log("❌ Cannot test maintenance task - no car created")
+            self.logger.error("❌ Cannot test maintenance task - no car created")
             return False
 
-        task_data = {
-            "car_id": self.test_car_id,
-            "task_type": "oil_change",
-            "description": "Regular oil change",
-            "last_performed_mileage": 45000,
-            "interval_miles": 5000,
-            "interval_months": 6,
-            "notes": "Full synthetic oil"
-        }
-        success, response = self.run_test("Create Maintenance Task", "POST", "maintenance", 200, data=task_data)
+        task_data = fill_body(TASK_BODY, car_id=self.test_car_id)
+        success, response = await self.run_test("Create Maintenance Task", "POST", "maintenance", 200, data=task_data)
         if success and 'id' in response:
-            self.test_task_id = response['id']
-            self.log(f"   Created task ID: {self.test_task_id}")
+            self.set_task(response['id'])
+            self.logger.info("   Created task ID: %s", self.test_task_id)
             return True
         return False
 
-    def test_get_maintenance_tasks(self):
+    async def test_get_maintenance_tasks(self):
         """Test getting maintenance tasks"""
-        success, response = self.run_test("Get Maintenance Tasks", "GET", "maintenance", 200)
+        await self.task_created
+        success, response = await self.run_test("Get Maintenance Tasks", "GET", "maintenance", 200)
         if success and isinstance(response, list):
-            self.log(f"   Found {len(response)} maintenance tasks")
+            self.logger.info("   Found %d maintenance tasks", len(response))
             return True
         return False
 
-    def test_complete_maintenance_task(self):
+    async def test_complete_maintenance_task(self):
         """Test completing maintenance task"""
+        await self.task_created
         if not self.test_task_id:
-            self.log("❌ Cannot test complete task - no task created")
+            self.logger.error("❌ Cannot test complete task - no task created")
             return False
 
-        success, response = self.run_test(
+        success, response = await self.run_test(
             "Complete Maintenance Task", 
             "POST", 
-            f"maintenance/{self.test_task_id}/complete", 
+            self.task_complete_path, 
             200,
             params={"mileage": 55000}
         )
         return success
 
-    def test_log_mileage(self):
+    async def test_log_mileage(self):
         """Test logging mileage"""
+        await self.car_created
         if not self.test_car_id:
-            self.log("❌ Cannot test mileage log - no car created")
+            self.logger.error("❌ Cannot test mileage log - no car created")
             return False
 
-        mileage_data = {
-            "car_id": self.test_car_id,
-            "mileage": 55500,
-            "notes": "Highway trip"
-        }
-        success, response = self.run_test("Log Mileage", "POST", "mileage", 200, data=mileage_data)
+        mileage_data = fill_body(MILEAGE_BODY, car_id=self.test_car_id, mileage=55500)
+        success, response = await self.run_test("Log Mileage", "POST", "mileage", 200, data=mileage_data)
         return success
 
-    def test_get_mileage_logs(self):
+    async def test_get_mileage_logs(self):
         """Test getting mileage logs"""
+        await self.car_created
         if not self.test_car_id:
-            self.log("❌ Cannot test get mileage logs - no car created")
+            self.logger.error("❌ Cannot test get mileage logs - no car created")
             return False
 
-        success, response = self.run_test("Get Mileage Logs", "GET", f"mileage/{self.test_car_id}", 200)
+        success, response = await self.run_test("Get Mileage Logs", "GET", self.car_mileage_path, 200)
         if success and isinstance(response, list):
-            self.log(f"   Found {len(response)} mileage logs")
+            self.logger.info("   Found %d mileage logs", len(response))
             return True
         return False
 
-    def test_ai_chat(self):
+    async def test_mileage_log_paging(self):
+        """Test keyset paging of mileage logs with limit, cursor and X-Next-Cursor"""
+        await self.car_created
+        if not self.test_car_id:
+            self.logger.error("❌ Cannot test mileage paging - no car created")
+            return False
+
+        # Two logs of our own guarantee a second page even if Log Mileage has not run yet
+        for mileage in (56000, 57000):
+            body = fill_body(MILEAGE_BODY, car_id=self.test_car_id, mileage=mileage)
+            success, _ = await self.run_test("Log Mileage For Paging", "POST", "mileage", 200, data=body)
+            if not success:
+                return False
+
+        success, first, response = await self.run_test_response("Mileage Logs Page 1", "GET", self.car_mileage_path, 200,
+                                                                params={"limit": 1})
+        cursor = response.headers.get(NEXT_CURSOR_HEADER) if success else None
+        if not (success and len(first) == 1 and cursor):
+            self.logger.error("❌ Mileage Logs Page 1 - expected one log and an %s header", NEXT_CURSOR_HEADER)
+            return False
+
+        success, second = await self.run_test("Mileage Logs Page 2", "GET", self.car_mileage_path, 200,
+                                              params={"limit": 1, "cursor": cursor})
+        if not (success and len(second) == 1 and second[0]['id'] != first[0]['id']):
+            self.logger.error("❌ Mileage Logs Page 2 - expected the next log after the cursor")
+            return False
+
+        # Cursor values must be plain strings; a Mongo operator in one is rejected
+        forged = base64.urlsafe_b64encode(orjson.dumps([{"$ne": None}, "x"])).decode()
+        success, _ = await self.run_test("Reject Forged Cursor", "GET", self.car_mileage_path, 400,
+                                         params={"cursor": forged})
+        return success
+
+    async def test_ai_chat(self):
         """Test AI mechanic chat"""
-        chat_data = {
-            "message": "What should I check if my car won't start?",
-            "car_id": self.test_car_id
-        }
-        success, response = self.run_test("AI Chat", "POST", "chat", 200, data=chat_data)
-        if success and 'response' in response:
-            self.log(f"   AI response length: {len(response['response'])} chars")
+        await self.car_created
+        chat_data = fill_body(CHAT_BODY, car_id=self.test_car_id)
+        # Only the size of the reply is reported, so stream it rather than decode it
+        success, size = await self.run_test("AI Chat", "POST", "chat", 200, data=chat_data, discard_body=True)
+        if success and size:
+            self.logger.info("   AI response size: %d bytes", size)
             return True
         return False
 
-    def test_dashboard_stats(self):
+    async def test_dashboard_stats(self):
         """Test dashboard statistics"""
-        success, response = self.run_test("Dashboard Stats", "GET", "dashboard/stats", 200)
+        await self.registered
+        success, response = await self.run_test("Dashboard Stats", "GET", "dashboard/stats", 200)
         if success and 'total_cars' in response:
-            self.log(f"   Stats: {response.get('total_cars')} cars, {response.get('total_tasks')} tasks")
+            self.logger.info("   Stats: %s cars, %s tasks", response.get('total_cars'), response.get('total_tasks'))
             return True
         return False
 
-    def test_settings(self):
+    async def test_settings(self):
         """Test settings endpoints"""
+        await self.registered
         # Get settings
-        success1, settings = self.run_test("Get Settings", "GET", "settings", 200)
+        success1, settings = await self.run_test("Get Settings", "GET", "settings", 200)
         
         # Update settings
-        update_data = {
-            "email_reminders": True,
-            "push_notifications": False,
-            "reminder_days_before": 14
-        }
-        success2, _ = self.run_test("Update Settings", "PUT", "settings", 200, data=update_data)
+        success2, _ = await self.run_test("Update Settings", "PUT", "settings", 200, data=SETTINGS_BODY)
         
         return success1 and success2
 
-    def run_all_tests(self):
+    async def run_all_tests(self):
         """Run comprehensive API tests"""
-        self.log("🚀 Starting AutoTrack API Tests")
-        self.log(f"📍 Testing against: {self.base_url}")
+        self.logger.info("🚀 Starting AutoTrack API Tests")
+        self.logger.info("📍 Testing against: %s", self.base_url)
         
         # Health and Auth tests
         tests = [
             ("Health Check", self.test_health_check),
-            ("User Registration", self.test_register_user),
-            ("User Authentication", self.test_login_user),
         ]
+        if self.bootstrap:
+            tests.append(("Bootstrap", self.test_bootstrap))
+        else:
+            tests.append(("User Registration", self.test_register_user))
+        tests.append(("User Authentication", self.test_login_user))
         
         # Car management tests
+        if not self.bootstrap:
+            tests.append(("Create Car", self.test_create_car))
         tests.extend([
-            ("Create Car", self.test_create_car),
             ("Get Cars", self.test_get_cars),
             ("Get Car Details", self.test_get_car_details),
         ])
         
         # Maintenance tests
+        if not self.bootstrap:
+            tests.append(("Create Maintenance Task", self.test_create_maintenance_task))
         tests.extend([
-            ("Create Maintenance Task", self.test_create_maintenance_task),
             ("Get Maintenance Tasks", self.test_get_maintenance_tasks),
             ("Complete Maintenance Task", self.test_complete_maintenance_task),
         ])
@@ -261,6 +510,7 @@ class AutoTrackAPITester:
         tests.extend([
             ("Log Mileage", self.test_log_mileage),
             ("Get Mileage Logs", self.test_get_mileage_logs),
+            ("Mileage Log Paging", self.test_mileage_log_paging),
         ])
         
         # Feature tests
@@ -270,45 +520,117 @@ class AutoTrackAPITester:
             ("Settings", self.test_settings),
         ])
 
-        failed_tests = []
-        for test_name, test_func in tests:
-            try:
-                if not test_func():
-                    failed_tests.append(test_name)
-            except Exception as e:
-                self.log(f"❌ {test_name} - Exception: {str(e)}")
-                failed_tests.append(test_name)
-            
-            time.sleep(0.5)  # Brief pause between tests
-
-        # Print results
-        self.log("\n" + "="*60)
-        self.log(f"📊 FINAL RESULTS")
-        self.log(f"✅ Tests passed: {self.tests_passed}/{self.tests_run}")
-        self.log(f"❌ Tests failed: {len(failed_tests)}/{self.tests_run}")
-        
-        if failed_tests:
-            self.log("\n❌ Failed tests:")
-            for test in failed_tests:
-                self.log(f"   - {test}")
-        
-        success_rate = (self.tests_passed / self.tests_run * 100) if self.tests_run > 0 else 0
-        self.log(f"\n📈 Success Rate: {success_rate:.1f}%")
-        
-        return len(failed_tests) == 0
+        # Every test starts at once; tests that need the user, car or task await
+        # the test that creates it, so only real dependencies are serialized.
+        # HTTP failures are reported by run_test; any other exception is a bug
+        # and cancels the rest of the group instead of being logged and skipped
+        async with asyncio.TaskGroup() as tg:
+            runs = {test_name: tg.create_task(test_func(), name=test_name) for test_name, test_func in tests}
+            if self.bootstrap:
+                self.registered = self.car_created = self.task_created = runs["Bootstrap"]
+            else:
+                self.registered = runs["User Registration"]
+                self.car_created = runs["Create Car"]
+                self.task_created = runs["Create Maintenance Task"]
+
+        # Results are summarized once per run by run_suite, across all testers
+        return [test_name for test_name, run in runs.items() if not run.result()]
+
+def log_summary(tests_passed, tests_run, failures, suites):
+    """Log one combined result block for all suite runs"""
+    # The summary is logged at WARNING so it still shows in quiet mode
+    logger.warning("\n" + "="*60)
+    logger.warning("📊 FINAL RESULTS")
+    if suites > 1:
+        logger.warning("🔁 Suite runs: %d", suites)
+    logger.warning("✅ Tests passed: %d/%d", tests_passed, tests_run)
+    logger.warning("❌ Tests failed: %d/%d", sum(failures.values()), tests_run)
+    
+    if failures:
+        logger.warning("\n❌ Failed tests:")
+        for test, count in failures.items():
+            if suites > 1:
+                logger.warning("   - %s (%d/%d runs)", test, count, suites)
+            else:
+                logger.warning("   - %s", test)
+    
+    success_rate = (tests_passed / tests_run * 100) if tests_run > 0 else 0
+    logger.warning("\n📈 Success Rate: %.1f%%", success_rate)
+
+async def warm_up(client):
+    """Resolve the API host and open a pooled connection so the first timed test skips DNS, TCP and TLS setup"""
+    url = client.base_url
+    try:
+        await asyncio.get_running_loop().getaddrinfo(url.host, url.port or (443 if url.scheme == "https" else 80))
+        await client.head("", timeout=DEFAULT_TIMEOUT)
+    except (OSError, httpx.HTTPError) as e:
+        # The tests themselves will report an unreachable API
+        logger.warning("⚠️  Warmup failed: %s", e)
+
+async def run_suite(args):
+    """Run the suite users * repeat times, with at most `users` runs in flight"""
+    latency = LatencyRing()
+    suites = args.users * args.repeat
+    tests_passed = tests_run = 0
+    failures = collections.Counter()
+    user_slots = asyncio.Semaphore(args.users)
+    request_slots = asyncio.Semaphore(args.max_concurrency) if args.max_concurrency else None
+
+    async with create_client(args.base_url) as client:
+        await warm_up(client)
+
+        async def run_user():
+            nonlocal tests_passed, tests_run
+            async with user_slots:
+                tester = AutoTrackAPITester(client, args.base_url, request_slots=request_slots, deep=args.deep,
+                                            bootstrap=args.bootstrap, latency=latency)
+                failures.update(await tester.run_all_tests())
+                tests_passed += tester.tests_passed
+                tests_run += tester.tests_run
+
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(suites):
+                tg.create_task(run_user())
+
+    log_summary(tests_passed, tests_run, failures, suites)
+    latency.report()
+    return not failures
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="AutoTrack API tests")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="API root to test against")
+    parser.add_argument("--deep", action="store_true", help="also re-fetch data already returned by earlier calls (e.g. auth/me)")
+    parser.add_argument("--bootstrap", action="store_true", help="create the user, car and task with one POST /bootstrap")
+    parser.add_argument("--users", type=positive_int, default=1, help="number of concurrent virtual users")
+    parser.add_argument("--repeat", type=positive_int, default=1, help="suite runs per virtual user")
+    parser.add_argument("--max-concurrency", type=positive_int, default=None,
+                        help="cap on requests in flight across all users (default: no cap)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only log failures and the final summary")
+    return parser.parse_args()
 
 def main():
-    tester = AutoTrackAPITester()
+    args = parse_args()
+    listener = configure_logging(args.quiet)
     
     try:
-        success = tester.run_all_tests()
+        # uvloop's libuv event loop has cheaper task switches when the tester itself is the bottleneck
+        run = uvloop.run if uvloop else asyncio.run
+        success = run(run_suite(args))
         return 0 if success else 1
     except KeyboardInterrupt:
-        print("\n⚠️  Tests interrupted by user")
+        logger.warning("\n⚠️  Tests interrupted by user")
         return 1
     except Exception as e:
-        print(f"\n💥 Unexpected error: {e}")
+        logger.error("\n💥 Unexpected error: %s", e)
         return 1
+    finally:
+        listener.stop()
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file